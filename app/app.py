@@ -1,12 +1,14 @@
+from __future__ import annotations
+
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
-from app.config import CORS_ORIGINS
+from app.config import CORS_ORIGINS_BYTES
 from app.dependencies import container
+from app.middleware import ASGICORSMiddleware
 from app.router import router as api_router
 
 # Настройка логирования
@@ -39,16 +41,14 @@ def create_app() -> FastAPI:
 
     # Улучшенная настройка CORS
     app.add_middleware(
-        CORSMiddleware,
-        allow_origins=CORS_ORIGINS,
+        ASGICORSMiddleware,
+        origins=CORS_ORIGINS_BYTES,
+        methods=["GET", "POST", "OPTIONS"],
+        headers=["Content-Type", "Authorization", "Accept"],
         allow_credentials=True,
-        allow_methods=["GET", "POST", "OPTIONS"],
-        allow_headers=["Content-Type", "Authorization", "Accept"],
+        max_age=86400,  # Браузер кэширует preflight на сутки
     )
 
-    # Настройка dependency injection
-    app.container = container
-
     return app
 
 
@@ -1,8 +1,11 @@
 import os
-from typing import List
+from typing import FrozenSet, List
 
 from dotenv import load_dotenv
 
+# Загружаем переменные окружения до чтения любых настроек
+load_dotenv()
+
 # CORS настройки
 CORS_ORIGINS: List[str] = [
     "http://localhost:8001",
@@ -27,14 +30,22 @@ if os.getenv("PRODUCTION_DOMAIN"):
         ]
     )
 
+# Разрешённые origin в виде байтов для сравнения с сырыми ASGI заголовками
+CORS_ORIGINS_BYTES: FrozenSet[bytes] = frozenset(
+    origin.encode("ascii") for origin in CORS_ORIGINS
+)
+
 # Настройки сервера
 HOST = os.getenv("HOST", "127.0.0.1")
 PORT = int(os.getenv("PORT", "8001"))
-RELOAD = os.getenv("RELOAD", "True").lower() == "true"
+RELOAD = os.getenv("RELOAD", "False").lower() == "true"
 DEBUG = os.getenv("DEBUG", "False").lower() == "true"
 
-# Загружаем переменные окружения
-load_dotenv()
+# Настройки запуска uvicorn
+# Кэши расписания и health check живут в памяти процесса: при нескольких воркерах
+# каждый грузит данные из Google сам, а /schedule?refresh=true обновляет только свой
+WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "warning")
 
 
 class Settings:
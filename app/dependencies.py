@@ -1,6 +1,15 @@
+from functools import lru_cache
+
 from dependency_injector import containers, providers
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import DATABASE_PATH
 from app.repository.user import UserRepository
@@ -9,6 +18,24 @@ from app.service.scheduler_service import SchedulerService
 from app.service.user_service import UserService
 
 
+def _set_sqlite_pragma(dbapi_connection, connection_record) -> None:
+    """Настройка SQLite при открытии нового соединения"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 МБ
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 МБ
+    cursor.close()
+
+
+def create_sqlite_engine(database_url: str, **kwargs) -> AsyncEngine:
+    """Создание асинхронного движка SQLite с настройкой PRAGMA"""
+    engine = create_async_engine(database_url, **kwargs)
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragma)
+    return engine
+
+
 class Container(containers.DeclarativeContainer):
     """Контейнер зависимостей"""
 
@@ -18,12 +45,17 @@ class Container(containers.DeclarativeContainer):
     # База данных
     database_url = providers.Singleton(lambda: f"sqlite+aiosqlite:///{DATABASE_PATH}")
 
-    # Асинхронный движок SQLAlchemy
+    # Асинхронный движок SQLAlchemy с пулом соединений
+    # (пул задан явно: старые версии SQLAlchemy 2.0 использовали для файловой
+    # SQLite NullPool, а версия SQLAlchemy в requirements не зафиксирована)
     engine = providers.Singleton(
-        create_async_engine,
+        create_sqlite_engine,
         database_url,
         echo=False,  # Отключаем логирование SQL запросов
         future=True,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=5,
+        max_overflow=10,
     )
 
     # Фабрика сессий
@@ -57,9 +89,15 @@ class Container(containers.DeclarativeContainer):
 container = Container()
 
 
+@lru_cache(maxsize=1)
+def _session_factory() -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий, получаемая из контейнера один раз"""
+    return container.session_factory()
+
+
 async def get_db_session() -> AsyncSession:
     """Dependency для получения сессии БД"""
-    session_factory = container.session_factory()
+    session_factory = _session_factory()
     async with session_factory() as session:
         try:
             yield session
@@ -70,25 +108,38 @@ async def get_db_session() -> AsyncSession:
             await session.close()
 
 
-def get_scheduler_service() -> SchedulerService:
-    """Dependency для получения сервиса планировщика"""
+@lru_cache(maxsize=1)
+def _scheduler_service() -> SchedulerService:
+    """Единственный экземпляр сервиса планировщика"""
     return container.scheduler_service()
 
 
-def get_user_repository(
+@lru_cache(maxsize=1)
+def _metro_service() -> MetroService:
+    """Единственный экземпляр сервиса метро"""
+    return container.metro_service()
+
+
+# Dependency ниже объявлены через async def: синхронные FastAPI выполняет в threadpool
+async def get_scheduler_service() -> SchedulerService:
+    """Dependency для получения сервиса планировщика"""
+    return _scheduler_service()
+
+
+async def get_user_repository(
     db_session: AsyncSession = Depends(get_db_session),
 ) -> UserRepository:
     """Dependency для получения репозитория пользователя"""
     return UserRepository(db_session)
 
 
-def get_user_service(
-    repository: UserRepository = Depends(get_user_repository),
+async def get_user_service(
+    db_session: AsyncSession = Depends(get_db_session),
 ) -> UserService:
     """Dependency для получения сервиса пользователя"""
-    return UserService(repository)
+    return UserService(UserRepository(db_session))
 
 
-def get_metro_service() -> MetroService:
+async def get_metro_service() -> MetroService:
     """Dependency для получения сервиса метро"""
-    return container.metro_service()
+    return _metro_service()
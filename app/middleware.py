@@ -0,0 +1,123 @@
+from typing import FrozenSet, Iterable, List
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Заголовки, которые браузер может отправлять без явного разрешения
+_SAFELISTED_HEADERS = frozenset(
+    (b"accept", b"accept-language", b"content-language", b"content-type")
+)
+
+
+class ASGICORSMiddleware:
+    """Чистый ASGI CORS middleware без создания Request/Response на каждый запрос"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        origins: FrozenSet[bytes],
+        methods: Iterable[str],
+        headers: Iterable[str],
+        allow_credentials: bool = False,
+        max_age: int = 600,
+    ):
+        self.app = app
+        methods = list(methods)
+        headers = list(headers)
+
+        # Все строки заголовков готовим один раз при создании middleware
+        self._origins = origins
+        self._methods = frozenset(method.encode("latin-1") for method in methods)
+        self._headers = _SAFELISTED_HEADERS | frozenset(
+            header.lower().encode("latin-1") for header in headers
+        )
+        self._allow_methods = ", ".join(methods).encode("latin-1")
+        self._allow_headers = ", ".join(headers).encode("latin-1")
+
+        simple_headers = [(b"vary", b"Origin")]
+        if allow_credentials:
+            simple_headers.append((b"access-control-allow-credentials", b"true"))
+        self._simple_headers = tuple(simple_headers)
+        self._preflight_headers = (
+            *self._simple_headers,
+            (b"access-control-allow-methods", self._allow_methods),
+            (b"access-control-allow-headers", self._allow_headers),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"content-length", b"0"),
+        )
+
+    def _headers_allowed(self, request_headers: bytes) -> bool:
+        """Проверка заголовков из Access-Control-Request-Headers"""
+        for header in request_headers.split(b","):
+            header = header.strip().lower()
+            if header and header not in self._headers:
+                return False
+        return True
+
+    async def _reject_preflight(self, send: Send, failures: List[str]) -> None:
+        """Ответ 400 на preflight с неразрешёнными origin/методом/заголовками"""
+        body = f"Disallowed CORS {', '.join(failures)}".encode("latin-1")
+        headers = [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+        await send({"type": "http.response.start", "status": 400, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = origin in self._origins
+
+        # Preflight запрос отвечаем сразу, не доходя до роутера
+        if request_method is not None and scope["method"] == "OPTIONS":
+            failures = []
+            if not allowed:
+                failures.append("origin")
+            if request_method not in self._methods:
+                failures.append("method")
+            if request_headers and not self._headers_allowed(request_headers):
+                failures.append("headers")
+            if failures:
+                await self._reject_preflight(send, failures)
+                return
+
+            headers = [(b"access-control-allow-origin", origin)]
+            headers.extend(self._preflight_headers)
+            await send(
+                {"type": "http.response.start", "status": 204, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        allow_origin = (b"access-control-allow-origin", origin)
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append(allow_origin)
+                headers.extend(self._simple_headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
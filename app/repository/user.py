@@ -1,7 +1,7 @@
 import json
 from datetime import date
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import UserProfileModel
@@ -9,6 +9,11 @@ from app.repository.base import SQLAlchemyRepository
 from app.schemas import UserProfileUpdateRequest
 from app.service.models import UserProfile
 
+# Запрос строится один раз, SQLAlchemy переиспользует его скомпилированную форму
+_SELECT_BY_TELEGRAM_ID = select(UserProfileModel).where(
+    UserProfileModel.telegram_id == bindparam("telegram_id")
+)
+
 
 class UserRepository(SQLAlchemyRepository):
     """Репозиторий для работы с пользователями"""
@@ -54,8 +59,9 @@ class UserRepository(SQLAlchemyRepository):
 
     async def get_user_by_telegram_id(self, telegram_id: int) -> UserProfile | None:
         """Получить пользователя по Telegram ID"""
-        stmt = select(self.model).where(self.model.telegram_id == telegram_id)
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(
+            _SELECT_BY_TELEGRAM_ID, {"telegram_id": telegram_id}
+        )
         db_model = result.scalar_one_or_none()
         if db_model:
             return self._model_to_pydantic(db_model)
@@ -73,8 +79,9 @@ class UserRepository(SQLAlchemyRepository):
         self, telegram_id: int, update_request: UserProfileUpdateRequest
     ) -> UserProfile | None:
         """Обновить профиль пользователя по Telegram ID"""
-        stmt = select(self.model).where(self.model.telegram_id == telegram_id)
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(
+            _SELECT_BY_TELEGRAM_ID, {"telegram_id": telegram_id}
+        )
         db_model = result.scalar_one_or_none()
 
         if not db_model:
@@ -95,8 +102,9 @@ class UserRepository(SQLAlchemyRepository):
 
     async def delete_user(self, telegram_id: int) -> bool:
         """Удалить пользователя по Telegram ID"""
-        stmt = select(self.model).where(self.model.telegram_id == telegram_id)
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(
+            _SELECT_BY_TELEGRAM_ID, {"telegram_id": telegram_id}
+        )
         db_model = result.scalar_one_or_none()
 
         if db_model:
@@ -107,8 +115,9 @@ class UserRepository(SQLAlchemyRepository):
 
     async def user_exists(self, telegram_id: int) -> bool:
         """Проверить существование пользователя по Telegram ID"""
-        stmt = select(self.model).where(self.model.telegram_id == telegram_id)
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(
+            _SELECT_BY_TELEGRAM_ID, {"telegram_id": telegram_id}
+        )
         return result.scalar_one_or_none() is not None
 
     async def get_users_by_status(self, status) -> list[UserProfile]:
@@ -1,7 +1,11 @@
+import asyncio
+import hashlib
+import time
 from datetime import date
-from typing import Any, Dict, List, Union
+from typing import Annotated, Any, Dict, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from loguru import logger
 
 from app.config import BOT_TOKEN
@@ -21,7 +25,7 @@ from app.schemas import (
     UserProfileUpdateRequest,
 )
 from app.service.metro_service import MetroService
-from app.service.models import UserProfile
+from app.service.models import Event, UserProfile
 from app.service.scheduler_service import SchedulerService
 from app.service.user_service import UserService
 from app.utils import (
@@ -31,86 +35,168 @@ from app.utils import (
 
 router = APIRouter()
 
+# Ответы health check сериализуем заранее: возможных вариантов всего два
+_HEALTHY_CONNECTED = orjson.dumps(
+    HealthResponse(status="healthy", google_api="connected").model_dump()
+)
+_HEALTHY_DISCONNECTED = orjson.dumps(
+    HealthResponse(status="healthy", google_api="disconnected").model_dump()
+)
+
+# Кэш результата health check: (время проверки, тело ответа)
+_HEALTH_TTL = 5.0
+_health_cache: Optional[Tuple[float, bytes]] = None
+_health_lock = asyncio.Lock()
+
+# Расписание можно кэшировать в браузере/CDN, актуальность проверяется по ETag
+_SCHEDULE_CACHE_CONTROL = "public, max-age=30"
+
+# Параметры запросов описываем один раз на уровне модуля
+_REFRESH_QUERY = Query(description="Принудительное обновление кэша", examples=[False])
+_START_DATE_QUERY = Query(description="Начальная дата", examples=[None])
+_END_DATE_QUERY = Query(description="Конечная дата", examples=[None])
+_LANGUAGE_QUERY = Query(
+    description="Язык для названий (ru, en, cn, all)", pattern="^(ru|en|cn|all)$"
+)
+_INCLUDE_LOCATION_QUERY = Query(description="Включать ли координаты станций")
+_USE_NUMERIC_KEYS_QUERY = Query(
+    description="Использовать числовые ключи вместо строковых"
+)
+
+
+# Ответы сериализуем сразу через orjson, минуя повторную валидацию FastAPI
+def _schedule_body(events: List[Event]) -> bytes:
+    """JSON тело ответа ScheduleResponse"""
+    return orjson.dumps({"events": [event.model_dump() for event in events]})
+
+
+def _json_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Ответ с уже сериализованным JSON телом"""
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _user_profile_response(user_profile: UserProfile) -> Response:
+    """Ответ UserProfileResponse"""
+    return _json_response(orjson.dumps({"user_profile": user_profile.model_dump()}))
+
+
+def _body_etag(body: bytes) -> str:
+    """ETag по содержимому тела ответа"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Совпадает ли ETag с одним из тегов If-None-Match (слабое сравнение)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
 
-@router.get("/health")
+
+@router.get("/health", response_model=None, responses={200: {"model": HealthResponse}})
 async def health_check(
     scheduler_service: SchedulerService = Depends(get_scheduler_service),
-) -> HealthResponse:
+) -> Response:
     """Проверка состояния API"""
-    try:
-        logger.info("Выполняется health check")
-        if scheduler_service.is_connected():
-            logger.info("Google API подключен")
-            return HealthResponse(status="healthy", google_api="connected")
-        else:
-            logger.warning("Google API отключен")
-            return HealthResponse(status="healthy", google_api="disconnected")
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
+    global _health_cache
+
+    cached = _health_cache
+    if cached and time.monotonic() - cached[0] < _HEALTH_TTL:
+        return _json_response(cached[1])
+
+    # Одновременные запросы ждут одну проверку вместо параллельных обращений к Google
+    async with _health_lock:
+        cached = _health_cache
+        now = time.monotonic()
+        if cached and now - cached[0] < _HEALTH_TTL:
+            return _json_response(cached[1])
+
+        try:
+            logger.info("Выполняется health check")
+            # Проверка может открывать соединение с Google, не блокируем event loop
+            if await asyncio.to_thread(scheduler_service.is_connected):
+                logger.info("Google API подключен")
+                body = _HEALTHY_CONNECTED
+            else:
+                logger.warning("Google API отключен")
+                body = _HEALTHY_DISCONNECTED
+        except Exception as e:
+            logger.error("Health check failed: {}", e)
+            raise HTTPException(
+                status_code=500, detail=f"Health check failed: {str(e)}"
+            )
+
+        _health_cache = (now, body)
+        return _json_response(body)
 
 
-@router.get("/schedule")
+@router.get("/schedule", response_model=ScheduleResponse)
 async def get_schedule(
-    refresh: bool = Query(
-        default=False, description="Принудительное обновление кэша", examples=[False]
-    ),
-    start_date: date = Query(
-        default=None, description="Начальная дата", examples=[None]
-    ),
-    end_date: date = Query(default=None, description="Конечная дата", examples=[None]),
+    request: Request,
+    refresh: Annotated[bool, _REFRESH_QUERY] = False,
+    start_date: Annotated[Optional[date], _START_DATE_QUERY] = None,
+    end_date: Annotated[Optional[date], _END_DATE_QUERY] = None,
     scheduler_service: SchedulerService = Depends(get_scheduler_service),
-) -> ScheduleResponse:
+) -> Response:
     """Получение расписания событий"""
     try:
         if refresh:
             logger.info("Принудительное обновление расписания")
             events = await scheduler_service.refresh_events()
-            logger.info(f"Обновлено {len(events)} событий")
-            return ScheduleResponse(events=events)
+            logger.info("Обновлено {} событий", len(events))
+            return _json_response(_schedule_body(events))
         else:
             logger.info("Запрос расписания")
             events = await scheduler_service.get_events(start_date, end_date)
-            return ScheduleResponse(events=events)
+
+            body = _schedule_body(events)
+            etag = _body_etag(body)
+            cache_headers = {"ETag": etag, "Cache-Control": _SCHEDULE_CACHE_CONTROL}
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=cache_headers)
+            return _json_response(body, cache_headers)
     except Exception as e:
-        logger.error(f"Failed to get schedule: {str(e)}")
+        logger.error("Failed to get schedule: {}", e)
         raise HTTPException(status_code=500, detail=f"Failed to get schedule: {str(e)}")
 
 
-@router.post("/schedule/add")
+@router.post("/schedule/add", response_model=ScheduleResponse)
 async def add_schedule(
     schedule: ScheduleResponse,
     scheduler_service: SchedulerService = Depends(get_scheduler_service),
-) -> ScheduleResponse:
+) -> Response:
     """Добавление события в расписание TODO"""
     # TODO: добавить валидацию данных
-    logger.info(f"Добавление события в расписание: {schedule}")
+    logger.info("Добавление события в расписание: {}", schedule)
 
-    scheduler_service.add_event(schedule.events)
-    return ScheduleResponse(events=[])
+    await scheduler_service.add_events(schedule.events)
+    return _json_response(_schedule_body([]))
 
 
-@router.get("/user/{telegram_id}")
+@router.get("/user/{telegram_id}", response_model=UserProfileResponse)
 async def get_user_profile(
     telegram_id: int,
     user_service: UserService = Depends(get_user_service),
-) -> UserProfileResponse:
+) -> Response:
     """Получение профиля пользователя TODO"""
     user_profile = await user_service.get_user_profile(telegram_id)
     if user_profile is None:
         raise HTTPException(status_code=404, detail="Пользователь не найден")
-    return UserProfileResponse(user_profile=user_profile)
+    return _user_profile_response(user_profile)
 
 
-@router.post("/user/create")
+@router.post("/user/create", response_model=UserProfileResponse)
 async def create_user_profile(
     user_profile: UserProfile,
     user_service: UserService = Depends(get_user_service),
-) -> UserProfileResponse:
+) -> Response:
     """Создание нового профиля пользователя"""
-    logger.info(f"Создание профиля пользователя: {user_profile}")
+    logger.info("Создание профиля пользователя: {}", user_profile)
     result = await user_service.create_user_profile(user_profile)
-    return UserProfileResponse(user_profile=result)
+    return _user_profile_response(result)
 
 
 @router.post("/user/update")
@@ -119,18 +205,18 @@ async def update_user_profile(
     user_service: UserService = Depends(get_user_service),
 ) -> bool:
     """Обновление профиля пользователя с указанием полей для изменения"""
-    logger.info(f"Обновление профиля пользователя: {update_request}")
+    logger.info("Обновление профиля пользователя: {}", update_request)
     result = await user_service.update_user_profile(
         update_request.telegram_id, update_request
     )
     return result is not None
 
 
-@router.post("/auth/telegram")
+@router.post("/auth/telegram", response_model=UserProfileResponse)
 async def telegram_auth(
     auth_request: TelegramAuthRequest,
     user_repository: UserRepository = Depends(get_user_repository),
-) -> UserProfileResponse:
+) -> Response:
     """Аутентификация через Telegram Mini App"""
     try:
         # Проверяем наличие BOT_TOKEN
@@ -174,41 +260,40 @@ async def telegram_auth(
                 detail="Пользователь не найден в базе данных. Обратитесь к администратору.",
             )
 
-        logger.info(f"Telegram аутентификация успешна для пользователя {telegram_id}")
-        return UserProfileResponse(user_profile=user_profile)
+        logger.info("Telegram аутентификация успешна для пользователя {}", telegram_id)
+        return _user_profile_response(user_profile)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Telegram auth failed: {str(e)}")
+        logger.error("Telegram auth failed: {}", e)
         raise HTTPException(status_code=500, detail=f"Telegram auth failed: {str(e)}")
 
 
-@router.get("/metro")
+@router.get(
+    "/metro",
+    response_model=None,
+    responses={200: {"model": Union[List[MetroLine], List[Dict[str, Any]]]}},
+)
 async def get_metro(
-    language: str = Query(
-        default="ru",
-        description="Язык для названий (ru, en, cn, all)",
-        pattern="^(ru|en|cn|all)$",
-    ),
-    include_location: bool = Query(
-        default=True,
-        description="Включать ли координаты станций",
-    ),
-    use_numeric_keys: bool = Query(
-        default=False,
-        description="Использовать числовые ключи вместо строковых",
-    ),
+    language: Annotated[str, _LANGUAGE_QUERY] = "ru",
+    include_location: Annotated[bool, _INCLUDE_LOCATION_QUERY] = True,
+    use_numeric_keys: Annotated[bool, _USE_NUMERIC_KEYS_QUERY] = False,
     metro_service: MetroService = Depends(get_metro_service),
-) -> Union[List[MetroLine], List[Dict[str, Any]]]:
+) -> Response:
     """Получение данных о метро с настройками сериализации"""
     if use_numeric_keys:
-        return metro_service.get_optimized_metro_data(
-            language=language,
-            include_location=include_location,
+        return _json_response(
+            orjson.dumps(
+                metro_service.get_optimized_metro_data(
+                    language=language,
+                    include_location=include_location,
+                )
+            )
         )
     else:
-        return metro_service.get_metro(
+        lines = metro_service.get_metro(
             language=language,
             include_location=include_location,
         )
+        return _json_response(orjson.dumps([line.model_dump() for line in lines]))
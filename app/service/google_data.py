@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from datetime import date
@@ -73,6 +74,11 @@ class GridScheduler:
 
     async def get_events_from_google_sheet(self) -> list[Event]:
         """Получает все события из Google Sheets"""
+        # gspread блокирующий, поэтому загрузка выполняется вне event loop
+        return await asyncio.to_thread(self._load_events_from_google_sheet)
+
+    def _load_events_from_google_sheet(self) -> list[Event]:
+        """Синхронно загружает и парсит события из Google Sheets"""
         # Подключаемся к Google Sheets если еще не подключены
         if not self.spreadsheet:
             if not self.connect():
@@ -1,19 +1,28 @@
+from __future__ import annotations
+
+import asyncio
 import logging
+import threading
+import time
 from datetime import date
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from aiocache import Cache, cached
 from fastapi import HTTPException
 
 from app.config import GRID_CREDENTIALS_PATH, SPREADSHEET_URL
-from app.service.google_data import GridScheduler, init_scheduler
 from app.service.models import Event
 
+if TYPE_CHECKING:
+    # gspread и polars тяжёлые, загружаем их только при первом обращении к таблице
+    from app.service.google_data import GridScheduler
+
 # Настройка логирования
 logger = logging.getLogger(__name__)
 
-# Инициализируем кэш
-cache = Cache(Cache.MEMORY)
+# Время жизни кэша событий в секундах
+EVENTS_CACHE_TTL = 600
+# Максимальное число закэшированных выборок по диапазону дат
+FILTERED_CACHE_SIZE = 128
 
 
 class SchedulerServiceError(Exception):
@@ -27,42 +36,75 @@ class SchedulerService:
 
     def __init__(self):
         self._scheduler: Optional[GridScheduler] = None
+        # Инициализация планировщика идёт в потоках, защищаем её от гонок
+        self._scheduler_lock = threading.Lock()
+        # Кэш событий: (время загрузки, события), записывается только refresh_events
+        self._events_cache: Optional[Tuple[float, List[Event]]] = None
+        # Выборки по (start_date, end_date) для текущего снимка событий
+        self._filtered_cache: Dict[
+            Tuple[Optional[date], Optional[date]], List[Event]
+        ] = {}
+        # Текущая загрузка событий, общая для одновременных запросов
+        self._refresh_task: Optional[asyncio.Task[List[Event]]] = None
 
     def _get_scheduler(self) -> GridScheduler:
         """Получение экземпляра планировщика (ленивая инициализация)"""
         if self._scheduler is None:
-            logger.info("Инициализация планировщика...")
-            self._scheduler = init_scheduler(SPREADSHEET_URL, GRID_CREDENTIALS_PATH)
-            if not self._scheduler:
-                logger.error("Не удалось инициализировать планировщик")
-                raise SchedulerServiceError("Failed to initialize scheduler")
-            logger.info("Планировщик успешно инициализирован")
+            with self._scheduler_lock:
+                if self._scheduler is None:
+                    from app.service.google_data import init_scheduler
+
+                    logger.info("Инициализация планировщика...")
+                    scheduler = init_scheduler(SPREADSHEET_URL, GRID_CREDENTIALS_PATH)
+                    if not scheduler:
+                        logger.error("Не удалось инициализировать планировщик")
+                        raise SchedulerServiceError("Failed to initialize scheduler")
+                    self._scheduler = scheduler
+                    logger.info("Планировщик успешно инициализирован")
         return self._scheduler
 
-    @cached(ttl=600, cache=Cache.MEMORY)
-    async def get_cached_events(
-        self, start_date: date = None, end_date: date = None
-    ) -> List[Event]:
-        """Получение событий с кэшированием"""
-        events = await self._get_events_raw()
-        return self._scheduler.filter_events(events, start_date, end_date)
+    async def _get_scheduler_async(self) -> GridScheduler:
+        """Получение планировщика без блокировки event loop"""
+        if self._scheduler is not None:
+            return self._scheduler
+        # Первое подключение к Google Sheets блокирующее, выполняем его в потоке
+        return await asyncio.to_thread(self._get_scheduler)
+
+    def _get_cached_events(self) -> Optional[List[Event]]:
+        """События из кэша, если он ещё не устарел"""
+        cached = self._events_cache
+        if cached and time.monotonic() - cached[0] < EVENTS_CACHE_TTL:
+            return cached[1]
+        return None
 
     async def _get_events_raw(self) -> List[Event]:
         """Получение событий без кэширования (внутренний метод)"""
         try:
-            scheduler = self._get_scheduler()
+            scheduler = await self._get_scheduler_async()
             events = await scheduler.get_events_from_google_sheet()
-            logger.info(f"Получено {len(events)} событий")
+            logger.info("Получено %s событий", len(events))
             return events
         except Exception as e:
-            logger.error(f"Ошибка при получении событий: {str(e)}")
+            logger.error("Ошибка при получении событий: %s", e)
             raise
 
     async def get_events(
         self, start_date: date = None, end_date: date = None
     ) -> List[Event]:
-        """Получение всех событий из Google Sheets"""
-        return await self.get_cached_events(start_date, end_date)
+        """Получение событий из Google Sheets с кэшированием"""
+        events = self._get_cached_events()
+        if events is None:
+            events = await self.refresh_events()
+
+        scheduler = await self._get_scheduler_async()
+        key = (start_date, end_date)
+        filtered = self._filtered_cache.get(key)
+        if filtered is None:
+            if len(self._filtered_cache) >= FILTERED_CACHE_SIZE:
+                self._filtered_cache.clear()
+            filtered = scheduler.filter_events(events, start_date, end_date)
+            self._filtered_cache[key] = filtered
+        return filtered
 
     def is_connected(self) -> bool:
         """Проверка подключения к Google Sheets"""
@@ -74,48 +116,75 @@ class SchedulerService:
 
     async def refresh_events(self) -> List[Event]:
         """Принудительное обновление событий с очисткой кэша"""
+        # Одновременные вызовы ждут одну загрузку из Google Sheets
+        task = self._refresh_task
+        if task is None:
+            task = asyncio.create_task(self._load_events())
+            task.add_done_callback(self._clear_refresh_task)
+            self._refresh_task = task
+        # shield: отмена одного запроса не прерывает общую загрузку
+        return await asyncio.shield(task)
+
+    def _clear_refresh_task(self, task: asyncio.Task[List[Event]]) -> None:
+        """Сброс завершённой загрузки событий"""
+        if self._refresh_task is task:
+            self._refresh_task = None
+        # Забираем исключение, иначе при отмене всех ожидающих asyncio
+        # залогирует "Task exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    async def _load_events(self) -> List[Event]:
+        """Загрузка событий и запись их в кэш"""
         logger.info("Принудительное обновление событий")
-        await cache.clear()
-        return await self._get_events_raw()
+        events = await self._get_events_raw()
+        self._events_cache = (time.monotonic(), events)
+        self._filtered_cache = {}
+        return events
 
     async def add_events(self, events: list[Event]) -> list[Event]:
         """Добавление событий с валидацией"""
-        scheduler = self._get_scheduler()
-        added_events = []
+        scheduler = await self._get_scheduler_async()
 
+        # Сначала проверяем всю пачку: дубликаты внутри запроса и в таблице
+        seen = set()
         for event in events:
-            try:
-                # Проверка конфликтов с существующими событиями
-                if await self._has_conflict(event):
-                    raise HTTPException(
-                        status_code=409,
-                        detail=f"Конфликт с существующим событием: {event.project} на {event.date}",
-                    )
-
-                # Добавляем событие через планировщик
-                await scheduler.add_event(event)
-                added_events.append(event)
-                logger.info(
-                    f"Добавлено событие: {event.project} - {event.date} - {event.activity}"
+            key = (event.project, event.date, event.activity)
+            if key in seen or await self._has_conflict(event):
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Конфликт с существующим событием: {event.project} на {event.date}",
                 )
+            seen.add(key)
 
-            except HTTPException:
-                raise
+        if not events:
+            return []
 
-            except Exception as e:
-                logger.error(f"Неожиданная ошибка при добавлении события {event}: {e}")
-                raise HTTPException(
-                    status_code=500, detail=f"Не удалось добавить событие: {str(e)}"
-                )
-        return added_events
+        try:
+            # Запись в Google Sheets синхронная: один вызов на всю пачку вне event loop
+            await asyncio.to_thread(scheduler.add_event, events)
+        except Exception as e:
+            logger.error("Неожиданная ошибка при добавлении событий %s: %s", events, e)
+            raise HTTPException(
+                status_code=500, detail=f"Не удалось добавить события: {str(e)}"
+            )
+        finally:
+            # Таблица могла измениться: следующее чтение загрузит события заново
+            self._invalidate_events_cache()
+
+        logger.info("Добавлено %s событий", len(events))
+        return list(events)
+
+    def _invalidate_events_cache(self) -> None:
+        """Сброс кэша событий и выборок по датам"""
+        self._events_cache = None
+        self._filtered_cache = {}
 
     async def _has_conflict(self, event: Event) -> bool:
         """Проверка конфликтов с существующими событиями"""
         try:
-            scheduler = self._get_scheduler()
-
             # Получаем все события на указанную дату
-            existing_events = await scheduler.get_events_from_google_sheet(event.date)
+            existing_events = await self.get_events(event.date, event.date)
 
             for existing_event in existing_events:
                 # Проверяем только точное совпадение проекта, даты и активности
@@ -124,12 +193,12 @@ class SchedulerService:
                     and existing_event.date == event.date
                     and existing_event.activity == event.activity
                 ):
-                    logger.warning(f"Найден точный дубликат события: {event}")
+                    logger.warning("Найден точный дубликат события: %s", event)
                     return True
             return False
 
         except Exception as e:
-            logger.error(f"Ошибка при проверке конфликтов для события {event}: {e}")
+            logger.error("Ошибка при проверке конфликтов для события %s: %s", event, e)
             # В случае ошибки считаем, что конфликтов нет
             return False
 
@@ -138,14 +207,17 @@ class SchedulerService:
     ) -> List[Event]:
         """Получение событий за указанный период"""
         try:
-            scheduler = self._get_scheduler()
+            scheduler = await self._get_scheduler_async()
             events = await scheduler.get_events_for_period(start_date, end_date)
             logger.info(
-                f"Получено {len(events)} событий за период {start_date} - {end_date}"
+                "Получено %s событий за период %s - %s",
+                len(events),
+                start_date,
+                end_date,
             )
             return events
         except Exception as e:
-            logger.error(f"Ошибка при получении событий за период: {e}")
+            logger.error("Ошибка при получении событий за период: %s", e)
             raise HTTPException(
                 status_code=500, detail=f"Не удалось получить события: {str(e)}"
             )
@@ -2,16 +2,32 @@ import hashlib
 import hmac
 import json
 import logging
+from functools import lru_cache
 from urllib.parse import parse_qsl, unquote
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _telegram_secret_key(bot_token: str) -> bytes:
+    """Секретный ключ для проверки hash (key="WebAppData", msg=bot_token)"""
+    return hmac.new(
+        key=b"WebAppData", msg=bot_token.encode(), digestmod=hashlib.sha256
+    ).digest()
+
+
 def validate_telegram_init_data(init_data: str, bot_token: str) -> dict:
     """
     Валидирует init_data от Telegram Mini App согласно официальной документации.
     Поддерживает как hash (с bot token), так и signature (без bot token).
     """
+    # Повторные запросы сессии приходят с тем же init_data - проверяем его один раз
+    return dict(_validate_telegram_init_data(init_data, bot_token))
+
+
+@lru_cache(maxsize=1024)
+def _validate_telegram_init_data(init_data: str, bot_token: str) -> dict:
+    """Валидация init_data с кэшированием успешных результатов"""
     try:
         # 1. Парсим init_data в словарь
         params = dict(parse_qsl(init_data))
@@ -37,25 +53,25 @@ def validate_telegram_init_data(init_data: str, bot_token: str) -> dict:
             sorted_params = sorted(check_params.items())
             data_check_string = "\n".join(f"{k}={v}" for k, v in sorted_params)
 
-            logger.info(f"Строка для проверки: {data_check_string}")
+            logger.info("Строка для проверки: %s", data_check_string)
 
-            # Создаем секретный ключ (key="WebAppData", msg=bot_token)
-            secret_key = hmac.new(
-                key=b"WebAppData", msg=bot_token.encode(), digestmod=hashlib.sha256
-            ).digest()
+            # Секретный ключ зависит только от bot token и вычисляется один раз
+            secret_key = _telegram_secret_key(bot_token)
 
             # Вычисляем ожидаемый hash
             expected_hash = hmac.new(
                 key=secret_key, msg=data_check_string.encode(), digestmod=hashlib.sha256
             ).hexdigest()
 
-            logger.info(f"Ожидаемый hash: {expected_hash}")
-            logger.info(f"Полученный hash: {hash_value}")
+            logger.info("Ожидаемый hash: %s", expected_hash)
+            logger.info("Полученный hash: %s", hash_value)
 
             # Сравниваем хэши
             if not hmac.compare_digest(expected_hash, hash_value):
                 logger.error(
-                    f"Hash не совпадает. Ожидаемый: {expected_hash}, полученный: {hash_value}"
+                    "Hash не совпадает. Ожидаемый: %s, полученный: %s",
+                    expected_hash,
+                    hash_value,
                 )
                 raise ValueError("Hash не совпадает")
         else:
@@ -72,7 +88,7 @@ def validate_telegram_init_data(init_data: str, bot_token: str) -> dict:
         return user_data
 
     except Exception as e:
-        logger.error(f"Ошибка валидации init_data: {str(e)}")
+        logger.error("Ошибка валидации init_data: %s", e)
         raise ValueError(f"Ошибка валидации init_data: {str(e)}")
 
 
@@ -92,5 +108,5 @@ def parse_telegram_data_without_validation(init_data: str) -> dict:
         return user_data
 
     except Exception as e:
-        logger.error(f"Ошибка парсинга данных: {str(e)}")
+        logger.error("Ошибка парсинга данных: %s", e)
         raise ValueError(f"Ошибка парсинга данных: {str(e)}")
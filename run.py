@@ -5,7 +5,15 @@
 
 import uvicorn
 
-from app.config import HOST, PORT, RELOAD
+from app.config import HOST, LOG_LEVEL, PORT, RELOAD, WORKERS
 
 if __name__ == "__main__":
-    uvicorn.run("app.app:app", host=HOST, port=PORT, reload=RELOAD)
+    uvicorn.run(
+        "app.app:app",
+        host=HOST,
+        port=PORT,
+        reload=RELOAD,
+        # С reload uvicorn поддерживает только один процесс
+        workers=1 if RELOAD else WORKERS,
+        log_level=LOG_LEVEL,
+    )
@@ -0,0 +1,123 @@
+import asyncio
+
+from app.middleware import ASGICORSMiddleware
+
+ALLOWED_ORIGIN = b"http://localhost:5173"
+
+
+async def _downstream_app(scope, receive, send):
+    """Простое ASGI приложение, отвечающее 200"""
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def _make_middleware() -> ASGICORSMiddleware:
+    return ASGICORSMiddleware(
+        _downstream_app,
+        origins=frozenset([ALLOWED_ORIGIN]),
+        methods=["GET", "POST", "OPTIONS"],
+        headers=["Content-Type", "Authorization", "Accept"],
+        allow_credentials=True,
+        max_age=86400,
+    )
+
+
+def _call(method: str, headers: list) -> tuple:
+    """Выполняет запрос через middleware и возвращает (статус, заголовки, тело)"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": "/schedule", "headers": headers}
+    asyncio.run(_make_middleware()(scope, receive, send))
+
+    start, body = messages
+    return start["status"], dict(start["headers"]), body["body"]
+
+
+class TestASGICORSMiddleware:
+    """Тесты для ASGICORSMiddleware"""
+
+    def test_allowed_preflight(self):
+        """Тест preflight запроса с разрешённым origin"""
+        # Act
+        status, headers, body = _call(
+            "OPTIONS",
+            [
+                (b"origin", ALLOWED_ORIGIN),
+                (b"access-control-request-method", b"POST"),
+                (b"access-control-request-headers", b"content-type, authorization"),
+            ],
+        )
+
+        # Assert
+        assert status == 204
+        assert body == b""
+        assert headers[b"access-control-allow-origin"] == ALLOWED_ORIGIN
+        assert headers[b"access-control-allow-credentials"] == b"true"
+        assert headers[b"access-control-max-age"] == b"86400"
+        assert headers[b"access-control-allow-methods"] == b"GET, POST, OPTIONS"
+
+    def test_disallowed_origin_preflight(self):
+        """Тест preflight запроса с неразрешённым origin"""
+        # Act
+        status, headers, body = _call(
+            "OPTIONS",
+            [
+                (b"origin", b"https://evil.example"),
+                (b"access-control-request-method", b"GET"),
+            ],
+        )
+
+        # Assert
+        assert status == 400
+        assert body == b"Disallowed CORS origin"
+        assert b"access-control-allow-origin" not in headers
+
+    def test_disallowed_method_and_headers_preflight(self):
+        """Тест preflight запроса с неразрешёнными методом и заголовками"""
+        # Act
+        status, _, body = _call(
+            "OPTIONS",
+            [
+                (b"origin", ALLOWED_ORIGIN),
+                (b"access-control-request-method", b"DELETE"),
+                (b"access-control-request-headers", b"x-custom"),
+            ],
+        )
+
+        # Assert
+        assert status == 400
+        assert body == b"Disallowed CORS method, headers"
+
+    def test_simple_request_with_allowed_origin(self):
+        """Тест обычного запроса с разрешённым origin"""
+        # Act
+        status, headers, body = _call("GET", [(b"origin", ALLOWED_ORIGIN)])
+
+        # Assert
+        assert status == 200
+        assert body == b"{}"
+        assert headers[b"access-control-allow-origin"] == ALLOWED_ORIGIN
+        assert headers[b"access-control-allow-credentials"] == b"true"
+        assert headers[b"vary"] == b"Origin"
+
+    def test_request_without_origin_passes_through(self):
+        """Тест запроса без Origin: ответ приложения не изменяется"""
+        # Act
+        status, headers, body = _call("GET", [(b"accept", b"application/json")])
+
+        # Assert
+        assert status == 200
+        assert body == b"{}"
+        assert headers == {b"content-type": b"application/json"}
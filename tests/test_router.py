@@ -0,0 +1,94 @@
+from datetime import date
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_scheduler_service
+from app.router import _etag_matches
+from app.router import router as api_router
+from app.service.models import Event
+
+ETAG = '"abc123"'
+
+
+class FakeSchedulerService:
+    """Заглушка SchedulerService с фиксированным списком событий"""
+
+    def __init__(self):
+        self.events = [
+            Event(project="Школа Актива", date=date(2025, 1, 15), activity="Собрание")
+        ]
+
+    async def get_events(self, start_date=None, end_date=None):
+        return self.events
+
+    async def refresh_events(self):
+        return self.events
+
+
+def _make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(api_router)
+    service = FakeSchedulerService()
+    app.dependency_overrides[get_scheduler_service] = lambda: service
+    return TestClient(app)
+
+
+class TestEtagMatches:
+    """Тесты для разбора заголовка If-None-Match"""
+
+    def test_exact_match(self):
+        """Тест точного совпадения ETag"""
+        assert _etag_matches(ETAG, ETAG) is True
+
+    def test_match_in_list(self):
+        """Тест совпадения с одним из тегов в списке через запятую"""
+        assert _etag_matches(f'"other", {ETAG} , "third"', ETAG) is True
+
+    def test_weak_prefix(self):
+        """Тест слабого валидатора W/"""
+        assert _etag_matches(f"W/{ETAG}", ETAG) is True
+
+    def test_wildcard(self):
+        """Тест что * совпадает с любым ETag"""
+        assert _etag_matches("*", ETAG) is True
+
+    def test_mismatch(self):
+        """Тест несовпадающего ETag"""
+        assert _etag_matches('"other", W/"another"', ETAG) is False
+
+    def test_missing_header(self):
+        """Тест запроса без If-None-Match"""
+        assert _etag_matches(None, ETAG) is False
+        assert _etag_matches("", ETAG) is False
+
+
+class TestScheduleCaching:
+    """Тесты кэширующих заголовков эндпоинта /schedule"""
+
+    def test_matching_if_none_match_returns_304(self):
+        """Тест что совпадающий If-None-Match даёт 304 без тела"""
+        # Arrange
+        client = _make_client()
+        first = client.get("/schedule")
+        etag = first.headers["etag"]
+
+        # Act
+        response = client.get("/schedule", headers={"If-None-Match": f"W/{etag}"})
+
+        # Assert
+        assert first.status_code == 200
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == "public, max-age=30"
+
+    def test_refresh_has_no_etag(self):
+        """Тест что принудительное обновление не отдаёт ETag"""
+        # Act
+        response = _make_client().get("/schedule", params={"refresh": "true"})
+
+        # Assert
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.json()["events"][0]["activity"] == "Собрание"
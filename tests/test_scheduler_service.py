@@ -1,112 +1,204 @@
-from datetime import datetime
-from unittest.mock import Mock
+import asyncio
+import gc
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
 
 from app.service.models import Event
-from app.service.scheduler_service import (
-    MockDataProvider,
-    SchedulerService,
-    create_mock_scheduler_service,
-)
+from app.service.scheduler_service import SchedulerService
+
+
+class FakeScheduler:
+    """Заглушка GridScheduler с подсчётом обращений к Google Sheets"""
+
+    def __init__(self, events: list[Event]):
+        self.events = events
+        self.calls = 0
+        self.error: Exception | None = None
+        self.spreadsheet = True
+        self.added: list[list[Event]] = []
+
+    async def get_events_from_google_sheet(self) -> list[Event]:
+        self.calls += 1
+        # Отдаём управление, чтобы одновременные запросы успели встать в очередь
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        return self.events
+
+    def add_event(self, events: list[Event]) -> None:
+        self.added.append(list(events))
+
+    def filter_events(
+        self, events: list[Event], start_date: date = None, end_date: date = None
+    ) -> list[Event]:
+        return [
+            event
+            for event in events
+            if (start_date is None or event.date >= start_date)
+            and (end_date is None or event.date <= end_date)
+        ]
+
+
+def _event(day: int, activity: str = "Собрание") -> Event:
+    return Event(project="Школа Актива", date=date(2025, 1, day), activity=activity)
+
 
+def _make_service(events: list[Event]) -> tuple[SchedulerService, FakeScheduler]:
+    service = SchedulerService()
+    scheduler = FakeScheduler(events)
+    service._scheduler = scheduler
+    return service, scheduler
 
-class TestSchedulerService:
-    """Тесты для SchedulerService с использованием Dependency Injection"""
 
-    def test_get_events_with_mock_provider(self):
-        """Тест получения событий с mock провайдером"""
+class TestSchedulerServiceCache:
+    """Тесты кэширования событий в SchedulerService"""
+
+    def test_concurrent_misses_load_once(self):
+        """Тест что одновременные промахи кэша делают одну загрузку"""
         # Arrange
-        mock_events = [
-            Event(
-                title="Тестовое событие",
-                date=datetime.now(),
-                time="10:00",
-                description="Описание события",
-            )
-        ]
-        mock_provider = MockDataProvider(mock_events)
-        service = SchedulerService(mock_provider)
+        events = [_event(1), _event(2)]
+        service, scheduler = _make_service(events)
+
+        async def run():
+            return await asyncio.gather(*(service.get_events() for _ in range(5)))
 
         # Act
-        result = service.get_events()
+        results = asyncio.run(run())
 
         # Assert
-        assert result == mock_events
-        assert len(result) == 1
+        assert scheduler.calls == 1
+        assert all(result == events for result in results)
 
-    def test_is_connected_with_mock_provider(self):
-        """Тест проверки подключения с mock провайдером"""
+    def test_cached_events_are_reused(self):
+        """Тест что повторный запрос берёт события из кэша"""
         # Arrange
-        mock_provider = MockDataProvider()
-        service = SchedulerService(mock_provider)
+        service, scheduler = _make_service([_event(1), _event(2)])
+
+        async def run():
+            await service.get_events()
+            return await service.get_events(date(2025, 1, 2), date(2025, 1, 2))
 
         # Act
-        result = service.is_connected()
+        result = asyncio.run(run())
 
         # Assert
-        assert result is True
+        assert scheduler.calls == 1
+        assert result == [_event(2)]
 
-    def test_is_connected_with_disconnected_provider(self):
-        """Тест проверки подключения с отключенным провайдером"""
+    def test_refresh_invalidates_filtered_cache(self):
+        """Тест что refresh_events сбрасывает выборки по датам"""
         # Arrange
-        mock_provider = Mock()
-        mock_provider.spreadsheet = None
-        service = SchedulerService(mock_provider)
+        service, scheduler = _make_service([_event(1)])
+        day = date(2025, 1, 1)
+
+        async def run():
+            before = await service.get_events(day, day)
+            scheduler.events = [_event(1, "Новая активность")]
+            await service.refresh_events()
+            after = await service.get_events(day, day)
+            return before, after
 
         # Act
-        result = service.is_connected()
+        before, after = asyncio.run(run())
 
         # Assert
-        assert result is False
+        assert before == [_event(1)]
+        assert after == [_event(1, "Новая активность")]
+        assert scheduler.calls == 2
 
-    def test_refresh_events(self):
-        """Тест обновления событий"""
+    def test_failed_load_keeps_previous_snapshot(self):
+        """Тест что ошибка загрузки не затирает кэш и сбрасывает задачу"""
         # Arrange
-        mock_events = [Event(title="Событие", date=datetime.now(), time="12:00")]
-        mock_provider = MockDataProvider(mock_events)
-        service = SchedulerService(mock_provider)
+        events = [_event(1)]
+        service, scheduler = _make_service(events)
+
+        async def run():
+            await service.get_events()
+            snapshot = service._events_cache
+            scheduler.error = RuntimeError("Google Sheets недоступен")
+            with pytest.raises(RuntimeError):
+                await service.refresh_events()
+            await asyncio.sleep(0)
+            return snapshot
 
         # Act
-        result = service.refresh_events()
+        snapshot = asyncio.run(run())
 
         # Assert
-        assert result == mock_events
+        assert service._events_cache is snapshot
+        assert service._refresh_task is None
+        assert asyncio.run(service.get_events()) == events
 
+    def test_cancelled_then_failed_load_is_not_logged(self):
+        """Тест что ошибка загрузки после отмены всех ожидающих не теряется"""
+        # Arrange
+        service, scheduler = _make_service([_event(1)])
+        scheduler.error = RuntimeError("Google Sheets недоступен")
+        unhandled = []
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop.set_exception_handler(lambda _, context: unhandled.append(context))
+            waiter = asyncio.create_task(service.refresh_events())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            # Даём загрузке упасть и собираем завершённую задачу
+            for _ in range(3):
+                await asyncio.sleep(0)
+            gc.collect()
+
+        # Act
+        asyncio.run(run())
+
+        # Assert
+        assert scheduler.calls == 1
+        assert service._refresh_task is None
+        assert unhandled == []
 
-class TestMockDataProvider:
-    """Тесты для MockDataProvider"""
 
-    def test_mock_provider_returns_events(self):
-        """Тест что mock провайдер возвращает события"""
+class TestSchedulerServiceAddEvents:
+    """Тесты добавления событий в SchedulerService"""
+
+    def test_add_events_writes_batch_once(self):
+        """Тест что пачка событий записывается одним вызовом"""
         # Arrange
-        events = [Event(title="Тест", date=datetime.now(), time="15:00")]
-        provider = MockDataProvider(events)
+        service, scheduler = _make_service([_event(1)])
+        new_events = [_event(2), _event(3)]
 
         # Act
-        result = provider.get_events_from_google_sheet()
+        result = asyncio.run(service.add_events(new_events))
 
         # Assert
-        assert result == events
+        assert result == new_events
+        assert scheduler.added == [new_events]
+        assert service._events_cache is None
 
-    def test_mock_provider_has_spreadsheet_property(self):
-        """Тест что mock провайдер имеет свойство spreadsheet"""
+    def test_duplicates_in_request_conflict(self):
+        """Тест что одинаковые события в одном запросе дают 409"""
         # Arrange
-        provider = MockDataProvider()
-
-        # Act & Assert
-        assert provider.spreadsheet is True
+        service, scheduler = _make_service([_event(1)])
 
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(service.add_events([_event(2), _event(2)]))
 
-class TestFactoryFunctions:
-    """Тесты для фабричных функций"""
+        # Assert
+        assert exc_info.value.status_code == 409
+        assert scheduler.added == []
 
-    def test_create_mock_scheduler_service(self):
-        """Тест создания сервиса с mock данными"""
+    def test_existing_event_conflicts(self):
+        """Тест что событие, уже существующее в таблице, даёт 409"""
         # Arrange
-        events = [Event(title="Фабрика", date=datetime.now(), time="20:00")]
+        service, scheduler = _make_service([_event(1)])
 
         # Act
-        service = create_mock_scheduler_service(events)
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(service.add_events([_event(1)]))
 
         # Assert
-        assert isinstance(service, SchedulerService)
-        assert service.get_events() == events
+        assert exc_info.value.status_code == 409
+        assert scheduler.added == []
@@ -0,0 +1,67 @@
+import hashlib
+import hmac
+import json
+from urllib.parse import urlencode
+
+import pytest
+
+from app.utils import _validate_telegram_init_data, validate_telegram_init_data
+
+BOT_TOKEN = "123456:TEST-TOKEN"
+
+
+def _make_init_data(user: dict, bot_token: str = BOT_TOKEN) -> str:
+    """Формирует init_data с корректным hash, как это делает Telegram"""
+    params = {"auth_date": "1700000000", "user": json.dumps(user)}
+    data_check_string = "\n".join(f"{k}={v}" for k, v in sorted(params.items()))
+    secret_key = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+    params["hash"] = hmac.new(
+        secret_key, data_check_string.encode(), hashlib.sha256
+    ).hexdigest()
+    return urlencode(params)
+
+
+class TestValidateTelegramInitData:
+    """Тесты для validate_telegram_init_data и его кэша"""
+
+    def setup_method(self):
+        _validate_telegram_init_data.cache_clear()
+
+    def test_bad_hash_is_not_cached(self):
+        """Тест что неверный hash отклоняется при каждом вызове"""
+        # Arrange
+        init_data = _make_init_data({"id": 1}, bot_token="999:OTHER-TOKEN")
+
+        # Act & Assert
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                validate_telegram_init_data(init_data, BOT_TOKEN)
+        assert _validate_telegram_init_data.cache_info().currsize == 0
+
+    def test_valid_init_data_is_cached(self):
+        """Тест что валидный init_data проверяется один раз"""
+        # Arrange
+        init_data = _make_init_data({"id": 42, "first_name": "Test"})
+
+        # Act
+        first = validate_telegram_init_data(init_data, BOT_TOKEN)
+        second = validate_telegram_init_data(init_data, BOT_TOKEN)
+
+        # Assert
+        assert first == second == {"id": 42, "first_name": "Test"}
+        info = _validate_telegram_init_data.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_returned_dict_is_a_copy(self):
+        """Тест что изменение результата не влияет на последующие вызовы"""
+        # Arrange
+        init_data = _make_init_data({"id": 42})
+
+        # Act
+        first = validate_telegram_init_data(init_data, BOT_TOKEN)
+        first["id"] = 0
+        second = validate_telegram_init_data(init_data, BOT_TOKEN)
+
+        # Assert
+        assert second == {"id": 42}